@@ -1,6 +1,22 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import pandas as pd
+import sys
+
+sys.path.append("..")
+from src.config import (
+    INTERIM_DATA_DIR,
+    PASTURE_LOCATIONS_FILE,
+    STATIONS_FILE,
+    PastureRegistry,
+)
+from src.services.plotting import plot_decimated
+from src.services.weather import (
+    WeatherAssigner,
+    has_station_data,
+    load_station_weather,
+    read_locations,
+)
 
 # Set global plot style and parameters
 plt.style.use("ggplot")
@@ -12,20 +28,12 @@ plt.rcParams["lines.markersize"] = 3
 # Read Data
 # ------------------------------------------------------
 
-p_13 = pd.read_pickle("../data/processed/p_13.pkl")
-p_14 = pd.read_pickle("../data/processed/p_14.pkl")
-p_15 = pd.read_pickle("../data/processed/p_15.pkl")
-p_16 = pd.read_pickle("../data/processed/p_16.pkl")
-p_18 = pd.read_pickle("../data/processed/p_18.pkl")
-p_20 = pd.read_pickle("../data/processed/p_20.pkl")
-weather = pd.read_pickle("../data/processed/weather.pkl")
-
-p_13.name = "P13"
-p_14.name = "P14"
-p_15.name = "P15"
-p_16.name = "P16"
-p_18.name = "P18"
-p_20.name = "P20"
+registry = PastureRegistry()
+
+# Pastures to process; None processes every pasture exported by dataset.py
+selected_pastures = None
+pastures = registry.select(selected_pastures, stage="processed")
+weather = registry.load_weather()
 
 # ------------------------------------------------------
 # Data Cleaning
@@ -38,20 +46,13 @@ weather.replace([-996.00], np.nan, inplace=True)
 # Calculate Growth Conditions
 # ------------------------------------------------------
 
-pasture_data = {
-    "P13": p_13,
-    "P14": p_14,
-    "P15": p_15,
-    "P16": p_16,
-    "P18": p_18,
-    "P20": p_20,
-}
-
 # Dictionary to store the results for each pasture
 pasture_results = {}
 
 # Calculate growing conditions for each pasture
-for pasture_name, pasture_df in pasture_data.items():
+for pasture in pastures:
+    pasture_name = pasture.pasture_id
+    pasture_df = pasture.load()
     pasture_df["Date"] = pd.to_datetime(pasture_df["Date"])
     years = pasture_df["Date"].dt.year.unique()
     results = []
@@ -106,7 +107,7 @@ for pasture_name, results in pasture_results.items():
     df["Pasture"] = pasture_name
     growth_conditions_df = pd.concat([growth_conditions_df, df], ignore_index=True)
 
-growth_conditions_df.to_csv("../data/interim/growth_conditions.csv", index=False)
+growth_conditions_df.to_csv(INTERIM_DATA_DIR / "growth_conditions.csv", index=False)
 
 growth_conditions_df.head()
 
@@ -115,28 +116,18 @@ growth_conditions_df.head()
 # Interpolate Missing for Pasture and weather data
 # ------------------------------------------------------
 
-# Dictionary of pastures and their corresponding dataframes
-pastures = {
-    "P13": p_13,
-    "P14": p_14,
-    "P15": p_15,
-    "P16": p_16,
-    "P18": p_18,
-    "P20": p_20,
-}
-
 # dict of pastures and weather data
 pasture_daily_data = {}
 
 # Loop through each pasture to interpolate and save the data
-for pasture_name, df in pastures.items():
+for pasture in pastures:
     # Interpolation logic
-    df.set_index("Date", inplace=True)
+    df = pasture.load().set_index("Date")
     df_daily = df.resample("D").mean().interpolate(method="linear")
     df_daily.reset_index(inplace=True)
 
     # Store the interpolated DataFrame in the dictionary
-    pasture_daily_data[pasture_name] = df_daily
+    pasture_daily_data[pasture.pasture_id] = df_daily
 
 # Impute missing values for each pasture
 for pasture_name, df in pasture_daily_data.items():
@@ -144,18 +135,15 @@ for pasture_name, df in pasture_daily_data.items():
     for col in numerical_cols:
         df[col].fillna(df[col].mean(), inplace=True)
 
-pasture_daily_data["P13"]
-pasture_daily_data["P14"]
-pasture_daily_data["P15"]
-pasture_daily_data["P16"]
-pasture_daily_data["P18"]
-pasture_daily_data["P20"]
+first_pasture = pastures[0].pasture_id
+pasture_daily_data[first_pasture]
 
+# Downsample the daily series to the plot width instead of drawing every day
 plt.figure()
-plt.plot(
-    pasture_daily_data["P13"]["Date"],
-    pasture_daily_data["P13"]["EVI"],
-    marker="o",
+plot_decimated(
+    plt.gca(),
+    pasture_daily_data[first_pasture]["Date"],
+    pasture_daily_data[first_pasture]["EVI"],
     linestyle="-",
 )
 plt.xlabel("Date")
@@ -171,10 +159,38 @@ for col in numerical_cols:
 
 
 # Save the interpolated data
-for pasture_name, df in pasture_daily_data.items():
-    output_filename = f"../data/interim/{pasture_name}_daily_interpolated.csv"
-    df.to_csv(output_filename, index=False)
-    print(f"Data saved to {output_filename}")
+for pasture in pastures:
+    pasture.save("daily_interpolated", pasture_daily_data[pasture.pasture_id])
+    print(f"Data saved to {pasture.path('daily_interpolated')}")
+
+
+# ------------------------------------------------------
+# Assign Weather to Pastures
+# ------------------------------------------------------
+
+# With station locations available, each pasture gets the inverse-distance
+# blend of its nearest stations; otherwise every pasture shares the weather sheet
+if has_station_data():
+    pasture_locations = read_locations(PASTURE_LOCATIONS_FILE).loc[
+        [pasture.pasture_id for pasture in pastures]
+    ]
+    stations = read_locations(STATIONS_FILE)
+    assigner = WeatherAssigner(stations, pasture_locations, k=3)
+
+    # Only the stations near some pasture are read
+    station_weather = load_station_weather(assigner.used_station_ids)
+    for df in station_weather.values():
+        df.replace([-996.00], np.nan, inplace=True)
+
+    pasture_weather = assigner.assign(station_weather)
+
+    # Impute days no nearby station observed
+    for pasture_name, df in pasture_weather.items():
+        numerical_cols = df.select_dtypes(include=["float64", "int"]).columns
+        for col in numerical_cols:
+            df[col] = df[col].fillna(df[col].mean())
+else:
+    pasture_weather = {pasture.pasture_id: weather for pasture in pastures}
 
 
 # ------------------------------------------------------
@@ -186,6 +202,7 @@ filtered_dfs = {}
 for pasture_name, df in pasture_daily_data.items():
     # Filter growth conditions for the current pasture
     filtered_growth = growth_conditions_df.query("Pasture == @pasture_name")
+    weather_df = pasture_weather[pasture_name]
     final_df = pd.DataFrame()
 
     # Iterate through each row in the filtered growth conditions
@@ -201,13 +218,13 @@ for pasture_name, df in pasture_daily_data.items():
             & (df["Date"].dt.year == year)
         )
         mask_weather = (
-            (weather["Date"] >= sos_date)
-            & (weather["Date"] <= eos_date)
-            & (weather["Date"].dt.year == year)
+            (weather_df["Date"] >= sos_date)
+            & (weather_df["Date"] <= eos_date)
+            & (weather_df["Date"].dt.year == year)
         )
 
         temp_filtered_df = df.loc[mask_df]
-        temp_filtered_weather = weather.loc[mask_weather]
+        temp_filtered_weather = weather_df.loc[mask_weather]
 
         # Merge the filtered growth and weather data
         temp_merged = pd.merge(
@@ -234,25 +251,12 @@ total_df_filtered = total_df_filtered.sort_values(by="Date")
 for pasture_name, df in filtered_dfs.items():
     print(pasture_name)
 
-p_13_daily_filtered = filtered_dfs.get("P13")
-p_14_daily_filtered = filtered_dfs.get("P14")
-p_15_daily_filtered = filtered_dfs.get("P16")
-p_16_daily_filtered = filtered_dfs.get("P16")
-p_18_daily_filtered = filtered_dfs.get("P18")
-p_20_daily_filtered = filtered_dfs.get("P20")
-
 # ------------------------------------------------------
 # Save Dataframe as pickle
 # ------------------------------------------------------
 
-output_directory = "../data/interim/"
-
 # Save each dataframe as a pickle file
-p_13_daily_filtered.to_pickle(f"{output_directory}p_13_daily_filtered.pkl")
-p_14_daily_filtered.to_pickle(f"{output_directory}p_14_daily_filtered.pkl")
-p_15_daily_filtered.to_pickle(f"{output_directory}p_15_daily_filtered.pkl")
-p_16_daily_filtered.to_pickle(f"{output_directory}p_16_daily_filtered.pkl")
-p_18_daily_filtered.to_pickle(f"{output_directory}p_18_daily_filtered.pkl")
-p_20_daily_filtered.to_pickle(f"{output_directory}p_20_daily_filtered.pkl")
-
-total_df_filtered.to_pickle(f"{output_directory}total_df_filtered.pkl")
+for pasture in pastures:
+    pasture.save("daily_filtered", filtered_dfs[pasture.pasture_id])
+
+total_df_filtered.to_pickle(INTERIM_DATA_DIR / "total_df_filtered.pkl")
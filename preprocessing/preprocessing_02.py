@@ -2,6 +2,10 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
 import numpy as np
+import sys
+
+sys.path.append("..")
+from src.config import INTERIM_DATA_DIR, PREPROCESSING_02_DIR, PastureRegistry
 
 # Set global plot style and parameters
 plt.style.use("ggplot")
@@ -13,16 +17,13 @@ plt.rcParams["lines.markersize"] = 3
 # Read Data
 # ------------------------------------------------------
 
-input_directory = "../data/interim/"
+registry = PastureRegistry()
+
+# Pastures to process; None processes every pasture filtered by preprocessing_01
+selected_pastures = None
+pastures = registry.select(selected_pastures, stage="daily_filtered")
 
-# Read each pickle file into a dataframe
-p_13_daily_filtered = pd.read_pickle(f"{input_directory}p_13_daily_filtered.pkl")
-p_14_daily_filtered = pd.read_pickle(f"{input_directory}p_14_daily_filtered.pkl")
-p_15_daily_filtered = pd.read_pickle(f"{input_directory}p_15_daily_filtered.pkl")
-p_16_daily_filtered = pd.read_pickle(f"{input_directory}p_16_daily_filtered.pkl")
-p_18_daily_filtered = pd.read_pickle(f"{input_directory}p_18_daily_filtered.pkl")
-p_20_daily_filtered = pd.read_pickle(f"{input_directory}p_20_daily_filtered.pkl")
-total_df_filtered = pd.read_pickle(f"{input_directory}total_df_filtered.pkl")
+total_df_filtered = pd.read_pickle(INTERIM_DATA_DIR / "total_df_filtered.pkl")
 
 
 # ------------------------------------------------------
@@ -30,16 +31,9 @@ total_df_filtered = pd.read_pickle(f"{input_directory}total_df_filtered.pkl")
 # ------------------------------------------------------
 
 # List of DataFrames and corresponding titles
-df_list = [
-    p_13_daily_filtered,
-    p_14_daily_filtered,
-    p_15_daily_filtered,
-    p_16_daily_filtered,
-    p_18_daily_filtered,
-    p_20_daily_filtered,
-    total_df_filtered,
-]
-titles = ["P13", "P14", "P15", "P16", "P18", "P20", "Total"]
+df_list = [pasture.load("daily_filtered") for pasture in pastures]
+df_list.append(total_df_filtered)
+titles = [pasture.pasture_id for pasture in pastures] + ["Total"]
 exclude_columns = ["Date", "LSWI", "YEAR", "MONTH", "DAY"]
 
 
@@ -106,15 +100,8 @@ from sklearn.preprocessing import FunctionTransformer, StandardScaler
 
 
 # List of dataframes to process
-datasets = {
-    "p_13_daily_filtered": p_13_daily_filtered,
-    "p_14_daily_filtered": p_14_daily_filtered,
-    "p_15_daily_filtered": p_15_daily_filtered,
-    "p_16_daily_filtered": p_16_daily_filtered,
-    "p_18_daily_filtered": p_18_daily_filtered,
-    "p_20_daily_filtered": p_20_daily_filtered,
-    "total_df_filtered": total_df_filtered,
-}
+datasets = {pasture.pasture_id: pasture.load("daily_filtered") for pasture in pastures}
+datasets["total_df_filtered"] = total_df_filtered
 
 log_columns = ["HDEGWCMN", "ATOT", "RAIN", "TR05", "TR25", "TR60"]
 exclude_columns = ["Date", "LSWI", "EVI", "YEAR", "MONTH", "DAY"]
@@ -162,14 +149,10 @@ for name, df in datasets.items():
 # Save Files
 # ------------------------------------------------------
 
-# Base output directory
-base_path = "../data/preprocessing_02/"
-
 # Save processed dataframes to CSV
-for name, df in processed_datasets.items():
-    # Generate file path dynamically
-    file_name = f"{name.replace('_', '').capitalize()}.csv"
-    output_path = f"{base_path}/{file_name}"
+for pasture in pastures:
+    pasture.save("preprocessed", processed_datasets[pasture.pasture_id])
 
-    # Save the dataframe
-    df.to_csv(output_path, index=False)
+processed_datasets["total_df_filtered"].to_csv(
+    PREPROCESSING_02_DIR / "Totaldffiltered.csv", index=False
+)
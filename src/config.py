@@ -0,0 +1,335 @@
+"""
+Project paths and a registry of the pasture datasets.
+
+Pasture IDs (P13, P14, ...) are discovered from the sheets of the raw
+Tallgrass-Prairie workbook and from the artifacts the pipeline has already
+written, so adding a pasture only means adding its sheet to the workbook.
+Each pasture is handed out as a lazy handle that reads a stage's data the
+first time it is asked for and keeps it cached afterwards.
+
+Example usage:
+    registry = PastureRegistry()
+    for pasture in registry.select(["P13", "P14"], stage="processed"):
+        df = pasture.load("processed")
+"""
+
+import re
+from pathlib import Path
+
+import pandas as pd
+
+# ------------------------------------------------------
+# Paths
+# ------------------------------------------------------
+
+PROJ_ROOT = Path(__file__).resolve().parents[1]
+
+DATA_DIR = PROJ_ROOT / "data"
+RAW_DATA_DIR = DATA_DIR / "raw"
+PROCESSED_DATA_DIR = DATA_DIR / "processed"
+INTERIM_DATA_DIR = DATA_DIR / "interim"
+PREPROCESSING_02_DIR = DATA_DIR / "preprocessing_02"
+
+REPORTS_DIR = PROJ_ROOT / "reports"
+FIGURES_DIR = REPORTS_DIR / "figures"
+
+RAW_DATASET = RAW_DATA_DIR / "Datasets" / "Challenge-1" / "C1 - Tallgrass-Prairie.xlsx"
+WEATHER_SHEET = "Weather data"
+
+# Locations of the pastures and weather stations (ID, Latitude, Longitude)
+# and one daily weather CSV per station, used to give each pasture the
+# weather of its nearest stations instead of the shared weather sheet
+PASTURE_LOCATIONS_FILE = RAW_DATA_DIR / "pasture_locations.csv"
+STATIONS_FILE = RAW_DATA_DIR / "weather_stations.csv"
+STATION_WEATHER_DIR = RAW_DATA_DIR / "weather_stations"
+
+# ------------------------------------------------------
+# Artifacts
+# ------------------------------------------------------
+
+# Sheets of the raw workbook that hold pasture data, e.g. "P13"
+PASTURE_ID_PATTERN = re.compile(r"^P(\d+)$")
+
+# Directory and file name template of each pasture artifact, keyed by stage.
+# "{num}" is the numeric part of the pasture ID and "{id}" the full ID.
+PASTURE_ARTIFACTS = {
+    "processed": (PROCESSED_DATA_DIR, "p_{num}.pkl"),
+    "daily_interpolated": (INTERIM_DATA_DIR, "{id}_daily_interpolated.csv"),
+    "daily_filtered": (INTERIM_DATA_DIR, "p_{num}_daily_filtered.pkl"),
+    "preprocessed": (PREPROCESSING_02_DIR, "P{num}dailyfiltered.csv"),
+}
+
+WEATHER_ARTIFACTS = {
+    "processed": (PROCESSED_DATA_DIR, "weather.pkl"),
+}
+
+# Checkpoint of the online season tracker (src/services/phenology.py)
+PHENOLOGY_STATE_FILE = INTERIM_DATA_DIR / "season_state.json"
+
+
+def read_artifact(path):
+    """
+    Reads a pipeline artifact, choosing the reader from the file suffix.
+
+    Parameters:
+    path : pathlib.Path - Path to a .pkl or .csv file.
+
+    Returns:
+    pandas DataFrame
+    """
+    if path.suffix == ".pkl":
+        return pd.read_pickle(path)
+    if path.suffix == ".csv":
+        return pd.read_csv(path, parse_dates=["Date"])
+    raise ValueError(f"Unsupported artifact type: {path}")
+
+
+def write_artifact(df, path):
+    """
+    Writes a pipeline artifact, choosing the writer from the file suffix.
+
+    Parameters:
+    df : pandas DataFrame - The dataframe to save.
+    path : pathlib.Path - Destination .pkl or .csv file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".pkl":
+        df.to_pickle(path)
+    elif path.suffix == ".csv":
+        df.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Unsupported artifact type: {path}")
+
+
+def _pasture_number(pasture_id):
+    match = PASTURE_ID_PATTERN.match(pasture_id)
+    if match is None:
+        raise ValueError(f"Not a pasture ID: {pasture_id!r}")
+    return match.group(1)
+
+
+def _pasture_key(pasture_id):
+    return int(_pasture_number(pasture_id))
+
+
+# ------------------------------------------------------
+# Pasture Registry
+# ------------------------------------------------------
+
+
+class PastureHandle:
+    """
+    Lazy handle on the data of a single pasture.
+
+    Nothing is read until a stage is first requested with `load`; the
+    dataframe is then cached on the handle so later steps reuse it.
+    """
+
+    def __init__(self, pasture_id, registry):
+        self.pasture_id = pasture_id
+        self.number = _pasture_number(pasture_id)
+        self._registry = registry
+        self._cache = {}
+
+    def __repr__(self):
+        loaded = ", ".join(self._cache) or "nothing"
+        return f"PastureHandle({self.pasture_id!r}, loaded: {loaded})"
+
+    def path(self, stage):
+        """
+        Returns the artifact path of this pasture for the given stage.
+
+        Parameters:
+        stage : str - A key of the registry's artifacts, e.g. 'processed'.
+        """
+        if stage not in self._registry.artifacts:
+            raise KeyError(f"Unknown pasture stage: {stage!r}")
+        directory, template = self._registry.artifacts[stage]
+        return directory / template.format(num=self.number, id=self.pasture_id)
+
+    def load(self, stage="processed"):
+        """
+        Returns the pasture's dataframe for a stage, reading it on first use.
+
+        Parameters:
+        stage : str - 'raw' reads the sheet from the workbook; any other
+            stage reads the artifact written by an earlier pipeline step.
+        """
+        if stage not in self._cache:
+            if stage == "raw":
+                df = self._registry.read_sheet(self.pasture_id)
+            else:
+                df = read_artifact(self.path(stage))
+            df.name = self.pasture_id
+            self._cache[stage] = df
+        return self._cache[stage]
+
+    def save(self, stage, df):
+        """
+        Writes the dataframe as this pasture's artifact for a stage and
+        keeps it cached so later steps in the same run do not re-read it.
+        """
+        write_artifact(df, self.path(stage))
+        df.name = self.pasture_id
+        self._cache[stage] = df
+
+    def release(self, stage=None):
+        """Drops one cached stage, or every cached stage if none is given."""
+        if stage is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(stage, None)
+
+
+class PastureRegistry:
+    """
+    Discovers the pastures of the dataset and hands out a lazy
+    `PastureHandle` for each of them.
+
+    Parameters:
+    dataset : path-like - The raw workbook with one sheet per pasture.
+    artifacts : dict - Stage -> (directory, file name template) of the
+        per-pasture artifacts. Defaults to PASTURE_ARTIFACTS.
+    """
+
+    def __init__(self, dataset=RAW_DATASET, artifacts=None):
+        self.dataset = Path(dataset)
+        self.artifacts = dict(PASTURE_ARTIFACTS if artifacts is None else artifacts)
+        self._handles = {}
+        self._weather = {}
+        self.discover()
+
+    def __repr__(self):
+        return f"PastureRegistry({self.ids})"
+
+    def __len__(self):
+        return len(self._handles)
+
+    def __iter__(self):
+        return iter(self._handles.values())
+
+    def __contains__(self, pasture_id):
+        return pasture_id in self._handles
+
+    def __getitem__(self, pasture_id):
+        try:
+            return self._handles[pasture_id]
+        except KeyError:
+            raise KeyError(
+                f"Unknown pasture {pasture_id!r}; known pastures: {self.ids}"
+            ) from None
+
+    @property
+    def ids(self):
+        return list(self._handles)
+
+    def discover(self, stage=None):
+        """
+        Scans for pastures and adds a handle for each one not seen before.
+
+        Handles that already exist are kept, together with anything they
+        have cached.
+
+        Parameters:
+        stage : str, optional - 'raw' scans only the workbook sheets, any
+            other stage only that stage's artifacts. None scans the sheets
+            and every artifact directory.
+
+        Returns:
+        sorted list of the pasture IDs found for the stage.
+        """
+        if stage is None:
+            found = set(self._sheet_pastures())
+            for artifact_stage in self.artifacts:
+                found.update(self._artifact_pastures(artifact_stage))
+        elif stage == "raw":
+            found = set(self._sheet_pastures())
+        else:
+            found = set(self._artifact_pastures(stage))
+
+        self._handles = {
+            pasture_id: self._handles.get(pasture_id) or PastureHandle(pasture_id, self)
+            for pasture_id in sorted(found | set(self._handles), key=_pasture_key)
+        }
+        return sorted(found, key=_pasture_key)
+
+    def select(self, pasture_ids=None, stage=None):
+        """
+        Returns the handles of the requested pastures, or of every pasture
+        available for the stage if none are requested.
+
+        Parameters:
+        pasture_ids : list of str, optional - e.g. ['P13', 'P20'].
+        stage : str, optional - The stage the caller is going to load;
+            only pastures with that stage's data ('raw' meaning a workbook
+            sheet) are returned. None returns every known pasture.
+
+        Raises:
+        FileNotFoundError - If a requested pasture has no data for the stage.
+        """
+        if stage is None:
+            available = self.ids
+        else:
+            available = self.discover(stage)
+
+        if pasture_ids is None:
+            return [self[pasture_id] for pasture_id in available]
+
+        missing = [p for p in pasture_ids if p not in available]
+        if stage is not None and missing:
+            raise FileNotFoundError(f"No {stage!r} data for pastures {missing}")
+        return [self[pasture_id] for pasture_id in pasture_ids]
+
+    def read_sheet(self, sheet_name):
+        """Reads a pasture sheet from the raw workbook."""
+        df = pd.read_excel(self.dataset, sheet_name=sheet_name)
+        df["Date"] = pd.to_datetime(df["Date"], format="%m/%d/%Y")
+        return df
+
+    def weather_path(self, stage="processed"):
+        directory, file_name = WEATHER_ARTIFACTS[stage]
+        return directory / file_name
+
+    def load_weather(self, stage="processed"):
+        """
+        Returns the weather dataframe for a stage, reading it on first use.
+        'raw' reads the weather sheet from the workbook as is.
+        """
+        if stage not in self._weather:
+            if stage == "raw":
+                df = pd.read_excel(self.dataset, sheet_name=WEATHER_SHEET)
+            else:
+                df = read_artifact(self.weather_path(stage))
+            self._weather[stage] = df
+        return self._weather[stage]
+
+    def save_weather(self, df, stage="processed"):
+        write_artifact(df, self.weather_path(stage))
+        self._weather[stage] = df
+
+    def _sheet_pastures(self):
+        if not self.dataset.exists():
+            return []
+        with pd.ExcelFile(self.dataset) as workbook:
+            sheet_names = workbook.sheet_names
+        return [name for name in sheet_names if PASTURE_ID_PATTERN.match(name)]
+
+    def _artifact_pastures(self, stage):
+        if stage not in self.artifacts:
+            raise KeyError(f"Unknown pasture stage: {stage!r}")
+        directory, template = self.artifacts[stage]
+        if not directory.is_dir():
+            return []
+        pattern = re.compile(
+            "^"
+            + re.escape(template)
+            .replace(re.escape("{num}"), r"(\d+)")
+            .replace(re.escape("{id}"), r"P(\d+)")
+            + "$"
+        )
+        pastures = []
+        for path in directory.iterdir():
+            match = pattern.match(path.name)
+            if match:
+                pastures.append(f"P{match.group(1)}")
+        return pastures
@@ -0,0 +1,211 @@
+"""
+Sliding-window (lookback -> target) samples for sequence models of EVI.
+
+The season-filtered frames from preprocessing_01/02 are packed into one
+contiguous array, one block per pasture-season. Windows are strided views
+into that array, so a day is stored once however many windows contain it,
+and only windows that stay inside a single pasture-season are exposed.
+
+By default the inputs are the weather columns only; past EVI is added to
+the window only when asked for with include_target=True.
+
+Example usage:
+    registry = PastureRegistry()
+    dataset = SequenceDataset.from_registry(registry, lookback=30)
+    for X, y in dataset.batches(batch_size=64, seed=42):
+        ...  # X: (64, 30, n_features), y: (64,)
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import as_strided
+
+# Columns that are never used as model inputs
+EXCLUDE_COLUMNS = ["Date", "LSWI", "YEAR", "MONTH", "DAY"]
+
+
+def season_segments(df, date_column="Date"):
+    """
+    Splits a season-filtered frame into its contiguous pasture-seasons.
+
+    A new segment starts at every change of year and at every gap of more
+    than one day, so windows never run from one season into the next.
+
+    Parameters:
+    df : pandas DataFrame - Frame with a daily date_column, one pasture.
+    date_column : str - Name of the date column.
+
+    Returns:
+    list of pandas DataFrame, one per segment, sorted by date.
+    """
+    df = df.sort_values(date_column).reset_index(drop=True)
+    dates = df[date_column]
+    new_segment = (dates.dt.year != dates.dt.year.shift()) | (
+        dates.diff() != pd.Timedelta(days=1)
+    )
+    segment_id = new_segment.cumsum()
+    return [segment for _, segment in df.groupby(segment_id, sort=False)]
+
+
+class SequenceDataset:
+    """
+    Windows of `lookback` days of features with the target `horizon` days
+    after the last day of the window.
+
+    Parameters:
+    features : numpy array - (n_days, n_features) rows of all segments,
+        one segment after the other.
+    targets : numpy array - (n_days,) target value of each row.
+    segment_lengths : list of int - Number of rows of each segment.
+    lookback : int - Number of days in each window.
+    horizon : int - Days between the last day of a window and its target,
+        at least 1; 1 predicts the day after the window.
+    feature_columns : list of str, optional - Names of the feature columns.
+    """
+
+    def __init__(
+        self,
+        features,
+        targets,
+        segment_lengths,
+        lookback,
+        horizon=1,
+        feature_columns=None,
+    ):
+        # The target day must lie after the window, or a target column among
+        # the features would put the label in the input
+        if lookback < 1 or horizon < 1:
+            raise ValueError("lookback and horizon must be >= 1")
+
+        self.features = np.ascontiguousarray(features, dtype=np.float32)
+        self.targets = np.ascontiguousarray(targets, dtype=np.float32)
+        if len(self.features) != len(self.targets):
+            raise ValueError("features and targets must have the same length")
+        if sum(segment_lengths) != len(self.features):
+            raise ValueError("segment_lengths must add up to the number of rows")
+
+        self.lookback = lookback
+        self.horizon = horizon
+        self.feature_columns = feature_columns
+
+        # Read-only view of every window start in the packed array,
+        # shape (n_days - lookback + 1, lookback, n_features)
+        n_rows, n_features = self.features.shape
+        row_stride, col_stride = self.features.strides
+        self._windows = as_strided(
+            self.features,
+            shape=(max(n_rows - lookback + 1, 0), lookback, n_features),
+            strides=(row_stride, row_stride, col_stride),
+            writeable=False,
+        )
+
+        # Only starts whose window and target fall inside one segment
+        span = lookback + horizon - 1
+        starts = []
+        offset = 0
+        for length in segment_lengths:
+            if length > span:
+                starts.append(np.arange(offset, offset + length - span))
+            offset += length
+        self.starts = np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames,
+        lookback,
+        horizon=1,
+        feature_columns=None,
+        target_column="EVI",
+        include_target=False,
+        date_column="Date",
+    ):
+        """
+        Builds the dataset from season-filtered frames.
+
+        Parameters:
+        frames : iterable of pandas DataFrame - One frame per pasture.
+        lookback, horizon : int - See SequenceDataset.
+        feature_columns : list of str, optional - Defaults to every numeric
+            column not in EXCLUDE_COLUMNS, except the target.
+        target_column : str - Column to predict.
+        include_target : bool - Add the target column's past values to the
+            default features. Ignored when feature_columns is given.
+        date_column : str - Name of the date column.
+        """
+        segments = [
+            segment
+            for df in frames
+            for segment in season_segments(df, date_column=date_column)
+        ]
+        if not segments:
+            raise ValueError("No data to build windows from")
+
+        if feature_columns is None:
+            feature_columns = [
+                col
+                for col in segments[0].select_dtypes(include="number").columns
+                if col not in EXCLUDE_COLUMNS
+                and (include_target or col != target_column)
+            ]
+
+        features = np.concatenate(
+            [segment[feature_columns].to_numpy(np.float32) for segment in segments]
+        )
+        targets = np.concatenate(
+            [segment[target_column].to_numpy(np.float32) for segment in segments]
+        )
+        return cls(
+            features,
+            targets,
+            [len(segment) for segment in segments],
+            lookback,
+            horizon=horizon,
+            feature_columns=list(feature_columns),
+        )
+
+    @classmethod
+    def from_registry(
+        cls, registry, lookback, pasture_ids=None, stage="daily_filtered", **kwargs
+    ):
+        """
+        Builds the dataset from the season-filtered artifacts of a
+        PastureRegistry. Extra keyword arguments go to `from_frames`.
+        """
+        pastures = registry.select(pasture_ids, stage=stage)
+        frames = [pasture.load(stage) for pasture in pastures]
+        return cls.from_frames(frames, lookback, **kwargs)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, i):
+        """Returns the (lookback, n_features) window view and its target."""
+        start = self.starts[i]
+        target = self.targets[start + self.lookback + self.horizon - 1]
+        return self._windows[start], target
+
+    def batches(self, batch_size, shuffle=True, seed=None, drop_last=False):
+        """
+        Yields (X, y) mini-batches of shape (batch_size, lookback,
+        n_features) and (batch_size,).
+
+        Only the windows of the current batch are copied out of the
+        packed array; the full set of windows is never materialized.
+
+        Parameters:
+        batch_size : int - Number of windows per batch.
+        shuffle : bool - Visit the windows in a random order.
+        seed : int, optional - Seed for the shuffle.
+        drop_last : bool - Skip the final batch if it is smaller.
+        """
+        order = self.starts
+        if shuffle:
+            order = np.random.default_rng(seed).permutation(order)
+
+        target_offset = self.lookback + self.horizon - 1
+        for i in range(0, len(order), batch_size):
+            batch = order[i : i + batch_size]
+            if drop_last and len(batch) < batch_size:
+                break
+            yield self._windows[batch], self.targets[batch + target_offset]
@@ -2,6 +2,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 import pandas as pd
 import os
+import sys
+
+sys.path.append("..")
+from src.config import FIGURES_DIR, PastureRegistry
+from src.services.plotting import plot_overview
 
 # Set global plot style and parameters
 plt.style.use("ggplot")
@@ -15,20 +20,12 @@ plt.rcParams["lines.linewidth"] = 2
 plt.rcParams["lines.markersize"] = 4.5
 
 
-p_13 = pd.read_pickle("../data/processed/p_13.pkl")
-p_14 = pd.read_pickle("../data/processed/p_14.pkl")
-p_15 = pd.read_pickle("../data/processed/p_15.pkl")
-p_16 = pd.read_pickle("../data/processed/p_16.pkl")
-p_18 = pd.read_pickle("../data/processed/p_18.pkl")
-p_20 = pd.read_pickle("../data/processed/p_20.pkl")
-weather = pd.read_pickle("../data/processed/weather.pkl")
+registry = PastureRegistry()
 
-p_13.name = "P13"
-p_14.name = "P14"
-p_15.name = "P15"
-p_16.name = "P16"
-p_18.name = "P18"
-p_20.name = "P20"
+# Pastures to plot; None plots every pasture exported by dataset.py
+selected_pastures = None
+pastures = registry.select(selected_pastures, stage="processed")
+weather = registry.load_weather()
 
 # ------------------------------------------------------
 # Initial Plots for Pastures Data
@@ -69,12 +66,24 @@ def plot_evi_by_year(df):
 
 
 # Example usage:
-plot_evi_by_year(p_13)
-plot_evi_by_year(p_14)
-plot_evi_by_year(p_15)
-plot_evi_by_year(p_16)
-plot_evi_by_year(p_18)
-plot_evi_by_year(p_20)
+for pasture in pastures:
+    plot_evi_by_year(pasture.load())
+
+# ------------------------------------------------------
+# Overview Plots for Pastures Data
+# ------------------------------------------------------
+
+# Whole date range of every pasture in one figure, downsampled with LTTB
+overview_path = FIGURES_DIR / "overview"
+overview_path.mkdir(parents=True, exist_ok=True)
+
+plot_overview(
+    {pasture.pasture_id: pasture.load() for pasture in pastures},
+    "EVI",
+    title="EVI over Time for all Pastures",
+    save_path=overview_path / "EVI_all_pastures.png",
+)
+plt.show()
 
 # ------------------------------------------------------
 # 01_Plots for Weather Data
@@ -202,6 +211,21 @@ Weather Data:
 
 """
 
+# ------------------------------------------------------
+# Overview Plots for Weather Data
+# ------------------------------------------------------
+
+# Min/max bucketing keeps the extremes of the spikier weather series
+weather_columns = ["TAVG", "TMIN", "HAVG", "VDEF"]
+plot_overview(
+    {column: weather for column in weather_columns},
+    {column: column for column in weather_columns},
+    method="minmax",
+    title="Weather Information over Time",
+    save_path=overview_path / "weather.png",
+)
+plt.show()
+
 # ------------------------------------------------------
 # 03_Plots for Weather Data
 # Identifying Correlations
@@ -0,0 +1,233 @@
+"""
+Online season tracking for streaming EVI observations.
+
+The growth-conditions step of preprocessing_01 computes SOS, peak and EOS
+in batch over completed years. This tracker keeps a bounded state per
+pasture instead and updates it as each observation arrives, using the same
+definitions:
+
+    c   - peak EVI of the growing season (March to October)
+    a   - minimum EVI before the peak, b - minimum EVI after the peak
+    SOS - first date before the peak with EVI >= a + 0.20 * (c - a)
+    EOS - last date after the peak with EVI <= b + 0.20 * (c - b)
+
+Peak, a, b and EOS are updated in O(1). SOS depends on every observation
+before the peak, so the season's observations are buffered, at most one
+per day of the growing season (about 15 at MODIS' 16-day cadence), and
+SOS is recomputed from the buffer whenever a new peak changes a or c.
+All values match the batch values for the observations seen so far.
+
+Example usage:
+    tracker = SeasonTracker.load(PHENOLOGY_STATE_FILE)
+    tracker.update("P13", "2024-05-10", 0.41)
+    tracker.status()
+    tracker.save(PHENOLOGY_STATE_FILE)
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass, field, fields
+
+import pandas as pd
+
+GROWING_SEASON_MONTHS = (3, 10)
+THRESHOLD = 0.20
+
+_DATE_FIELDS = ["last_date", "a_date", "c_date", "b_date", "sos_date", "eos_date"]
+
+
+@dataclass
+class SeasonState:
+    """
+    State of the current season of one pasture. `observations` holds the
+    season's (date, EVI) pairs, bounded by the length of the growing season.
+    """
+
+    year: int
+    last_date: pd.Timestamp = None
+    a: float = None
+    a_date: pd.Timestamp = None
+    c: float = None
+    c_date: pd.Timestamp = None
+    b: float = None
+    b_date: pd.Timestamp = None
+    sos_date: pd.Timestamp = None
+    eos_date: pd.Timestamp = None
+    observations: list = field(default_factory=list)
+
+    @property
+    def n_obs(self):
+        return len(self.observations)
+
+    def update(self, date, evi):
+        """Adds one in-season observation, on a later day than the previous one."""
+        self.observations.append((date, evi))
+        self.last_date = date
+
+        if self.c is None:
+            self.c, self.c_date = evi, date
+            return
+
+        if evi > self.c:
+            self._new_peak(date, evi)
+        else:
+            self._after_peak(date, evi)
+
+    def _new_peak(self, date, evi):
+        # Everything up to the old peak is now before the peak
+        for value, value_date in [(self.b, self.b_date), (self.c, self.c_date)]:
+            if value is not None and (self.a is None or value < self.a):
+                self.a, self.a_date = value, value_date
+
+        self.c, self.c_date = evi, date
+        self.b = self.b_date = None
+        self.eos_date = None
+
+        # a and c changed, so rescan the observations before the new peak
+        g1 = self.c - self.a
+        self.sos_date = next(
+            (
+                obs_date
+                for obs_date, value in self.observations[:-1]
+                if value >= self.a + THRESHOLD * g1
+            ),
+            None,
+        )
+
+    def _after_peak(self, date, evi):
+        if self.b is None or evi < self.b:
+            self.b, self.b_date = evi, date
+
+        # A lower b lowers the threshold, but this observation then meets it
+        # anyway, and otherwise the threshold is unchanged, so the latest
+        # observation meeting it is always the EOS
+        g2 = self.c - self.b
+        if evi <= self.b + THRESHOLD * g2:
+            self.eos_date = date
+
+    def summary(self):
+        """Returns the season in the layout of growth_conditions.csv."""
+        g1 = self.c - self.a if self.a is not None else None
+        g2 = self.c - self.b if self.b is not None else None
+        SOS = self.sos_date.dayofyear if self.sos_date is not None else None
+        EOS = self.eos_date.dayofyear if self.eos_date is not None else None
+        GSL = EOS - SOS if SOS is not None and EOS is not None else None
+        return {
+            "Year": self.year,
+            "c": self.c,
+            "c_date": self.c_date,
+            "a": self.a,
+            "b": self.b,
+            "g1": g1,
+            "g2": g2,
+            "SOS_date": self.sos_date,
+            "SOS": SOS,
+            "EOS_date": self.eos_date,
+            "EOS": EOS,
+            "GSL": GSL,
+            "n_obs": self.n_obs,
+            "last_date": self.last_date,
+        }
+
+    def to_dict(self):
+        state = asdict(self)
+        for name in _DATE_FIELDS:
+            if state[name] is not None:
+                state[name] = state[name].isoformat()
+        state["observations"] = [
+            [obs_date.isoformat(), value] for obs_date, value in self.observations
+        ]
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        state = dict(state)
+        for name in _DATE_FIELDS:
+            if state.get(name) is not None:
+                state[name] = pd.Timestamp(state[name])
+        state["observations"] = [
+            (pd.Timestamp(obs_date), value)
+            for obs_date, value in state.get("observations", [])
+        ]
+        return cls(**{f.name: state[f.name] for f in fields(cls) if f.name in state})
+
+
+class SeasonTracker:
+    """
+    Tracks the current growing season of many pastures from a stream of
+    EVI observations.
+
+    Observations of a pasture must arrive in date order, at most one per
+    day. Observations outside the growing season are ignored, and the
+    first observation of a new year starts a new season for that pasture.
+    """
+
+    def __init__(self, states=None):
+        self.states = dict(states or {})
+
+    def update(self, pasture_id, date, evi):
+        """
+        Adds one observation and returns the pasture's season state.
+
+        Parameters:
+        pasture_id : str - e.g. 'P13'.
+        date : date-like - Date of the observation.
+        evi : float - EVI of the observation; NaNs are ignored.
+        """
+        date = pd.Timestamp(date).normalize()
+        state = self.states.get(pasture_id)
+
+        if state is not None and state.last_date is not None:
+            if date <= state.last_date:
+                raise ValueError(
+                    f"Observation for {pasture_id} on {date.date()} is not after "
+                    f"the last one on {state.last_date.date()}"
+                )
+
+        first_month, last_month = GROWING_SEASON_MONTHS
+        if pd.isna(evi) or not first_month <= date.month <= last_month:
+            return state
+
+        if state is None or state.year != date.year:
+            state = self.states[pasture_id] = SeasonState(year=date.year)
+        state.update(date, float(evi))
+        return state
+
+    def update_many(self, df, pasture_column="Pasture"):
+        """
+        Adds the observations of a dataframe with pasture_column, 'Date' and
+        'EVI' columns, in date order.
+        """
+        for row in df.sort_values("Date").itertuples(index=False):
+            self.update(getattr(row, pasture_column), row.Date, row.EVI)
+
+    def status(self):
+        """Returns the current season of every pasture as a dataframe."""
+        rows = []
+        for pasture_id, state in self.states.items():
+            row = state.summary()
+            row["Pasture"] = pasture_id
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def save(self, path):
+        """Checkpoints the state of every pasture to a JSON file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {pasture_id: s.to_dict() for pasture_id, s in self.states.items()}
+
+        # Write then rename, so an interrupted save keeps the old checkpoint
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Restores a tracker from a checkpoint, or starts empty if none exists."""
+        if not path.exists():
+            return cls()
+        with open(path) as f:
+            state = json.load(f)
+        return cls(
+            {pasture_id: SeasonState.from_dict(s) for pasture_id, s in state.items()}
+        )
@@ -0,0 +1,244 @@
+"""
+Downsampling and overview plots for long time series.
+
+Drawing decades of daily data point by point is slow and gives huge PNGs
+without showing anything more than the screen can resolve. The helpers
+here decimate a series to roughly the pixel width of the axes before
+drawing, using largest-triangle-three-buckets (LTTB) or min/max bucketing.
+
+Example usage:
+    fig, ax = plt.subplots()
+    plot_decimated(ax, df["Date"], df["EVI"])
+
+    plot_overview({"P13": p13, "P14": p14}, "EVI", save_path="evi.png")
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+
+def _as_float(x):
+    """
+    Converts dates, time zone aware or not, (or anything numeric) to a
+    float64 array. Dates become nanoseconds since the epoch in UTC.
+    """
+    x = pd.Series(x)
+    if pd.api.types.is_datetime64_any_dtype(x.dtype):
+        return pd.DatetimeIndex(x).asi8.astype(np.float64)
+    return x.to_numpy(dtype=np.float64)
+
+
+def _bucket_edges(n, n_buckets, start=0):
+    """Splits positions start..n-1 into n_buckets nearly equal buckets."""
+    return np.linspace(start, n, n_buckets + 1).astype(np.int64)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Selects the points of a series to keep with largest-triangle-three-buckets.
+
+    The first and last points are always kept. The points in between are
+    split into n_out - 2 buckets, and from each bucket the point forming the
+    largest triangle with the previously kept point and the mean of the next
+    bucket is kept.
+
+    Parameters:
+    x : array-like - Sorted x values (numbers or datetimes), without NaNs.
+    y : array-like - y values, without NaNs.
+    n_out : int - Number of points to keep.
+
+    Returns:
+    numpy array of the integer positions of the kept points.
+    """
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = _bucket_edges(n - 1, n_out - 2, start=1)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    selected = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Mean of the next bucket; the last bucket looks at the final point
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        x_next = x[next_start:next_end].mean()
+        y_next = y[next_start:next_end].mean()
+
+        # Twice the triangle area, without the constant factor
+        area = np.abs(
+            (x[selected] - x_next) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (y_next - y[selected])
+        )
+        selected = start + int(np.argmax(area))
+        indices[i + 1] = selected
+
+    return indices
+
+
+def minmax_indices(y, n_out):
+    """
+    Selects the minimum and maximum of each bucket of a series.
+
+    Cheaper than LTTB and keeps every extreme, which suits spiky series
+    such as rainfall. The first and last points are always kept.
+
+    Parameters:
+    y : array-like - y values, without NaNs.
+    n_out : int - Approximate number of points to keep (two per bucket).
+
+    Returns:
+    numpy array of the sorted integer positions of the kept points.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    edges = _bucket_edges(n, n_buckets)
+    indices = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = y[start:end]
+        indices.append(start + int(np.argmin(bucket)))
+        indices.append(start + int(np.argmax(bucket)))
+
+    return np.unique(indices)
+
+
+def pixel_width(ax):
+    """Returns the width of the axes in display pixels."""
+    return max(int(ax.get_window_extent().width), 3)
+
+
+def decimate(x, y, n_out, method="lttb"):
+    """
+    Downsamples a series to about n_out points.
+
+    Missing values stay gaps in the plot: each run of non-NaN points is
+    downsampled on its own, with a share of n_out in proportion to its
+    length, and the first NaN after each run is kept so the line breaks.
+
+    Parameters:
+    x : pandas Series or array-like - Sorted x values (numbers or datetimes).
+    y : pandas Series or array-like - y values.
+    n_out : int - Number of points to keep.
+    method : str - 'lttb' or 'minmax'.
+
+    Returns:
+    tuple of (x, y) numpy arrays.
+    """
+    if method not in ("lttb", "minmax"):
+        raise ValueError(f"Unknown downsampling method: {method!r}")
+
+    # Keep x in pandas so time zone aware dates keep their dtype
+    x = pd.Series(x).reset_index(drop=True)
+    y = np.asarray(y, dtype=np.float64)
+    valid = ~np.isnan(y)
+    n_valid = int(valid.sum())
+    if n_valid == 0:
+        return x.iloc[:0].to_numpy(), y[:0]
+
+    # Start and end (exclusive) of each run of non-NaN points
+    edges = np.diff(np.concatenate([[0], valid.astype(np.int8), [0]]))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+
+    indices = []
+    for start, end in zip(run_starts, run_ends):
+        n_run = max(round(n_out * (end - start) / n_valid), 3)
+        if method == "lttb":
+            run_indices = lttb_indices(x.iloc[start:end], y[start:end], n_run)
+        else:
+            run_indices = minmax_indices(y[start:end], n_run)
+        indices.append(start + run_indices)
+        if end < len(y):
+            indices.append([end])
+
+    indices = np.concatenate(indices)
+    return x.iloc[indices].to_numpy(), y[indices]
+
+
+def plot_decimated(ax, x, y, method="lttb", n_out=None, **kwargs):
+    """
+    Plots a series on ax after downsampling it to the pixel width of ax.
+
+    Parameters:
+    ax : matplotlib Axes - The axes to draw on.
+    x, y : array-like - The series to plot.
+    method : str - 'lttb' or 'minmax'.
+    n_out : int, optional - Number of points to keep. Defaults to the
+        width of the axes in pixels.
+    **kwargs - Passed on to ax.plot.
+
+    Returns:
+    list of the Line2D objects added to ax.
+    """
+    if n_out is None:
+        n_out = pixel_width(ax)
+    x_out, y_out = decimate(x, y, n_out, method=method)
+    return ax.plot(x_out, y_out, **kwargs)
+
+
+def plot_overview(
+    dfs, column, method="lttb", title=None, save_path=None, date_column="Date"
+):
+    """
+    Draws one multi-year panel per dataframe in a single figure.
+
+    Each panel shows the whole date range of its dataframe, downsampled to
+    the pixel width of the panel, with the year boundaries marked.
+
+    Parameters:
+    dfs : dict - Panel title -> pandas DataFrame with date_column and column.
+    column : str or dict - The column to plot in every panel, e.g. 'EVI',
+        or a dict of panel title -> column.
+    method : str - 'lttb' or 'minmax'.
+    title : str, optional - Title of the figure.
+    save_path : path-like, optional - Where to save the figure.
+    date_column : str - Name of the date column.
+
+    Returns:
+    matplotlib Figure
+    """
+    width, height = plt.rcParams["figure.figsize"]
+    fig, axes = plt.subplots(
+        len(dfs),
+        1,
+        sharex=True,
+        squeeze=False,
+        figsize=(width, max(height, 2.5 * len(dfs))),
+    )
+    # Lay out first so the panel widths in pixels are known
+    fig.tight_layout()
+
+    for ax, (name, df) in zip(axes[:, 0], dfs.items()):
+        panel_column = column[name] if isinstance(column, dict) else column
+        df = df.sort_values(date_column)
+        plot_decimated(ax, df[date_column], df[panel_column], method=method)
+
+        years = df[date_column].dt.year.unique()
+        for year in years[1:]:
+            ax.axvline(pd.Timestamp(year=year, month=1, day=1), color="grey", lw=0.5)
+
+        ax.set_ylabel(panel_column)
+        ax.set_title(name, loc="left")
+        ax.grid(True)
+
+    axes[-1, 0].set_xlabel(date_column)
+    if title is not None:
+        fig.suptitle(title)
+    fig.tight_layout()
+
+    if save_path is not None:
+        fig.savefig(save_path)
+    return fig
@@ -0,0 +1,193 @@
+"""
+Assigns each pasture the weather of its nearest station(s).
+
+A KD-tree over the station coordinates is built once and queried for the
+k nearest stations of every pasture. The inverse-distance weights form a
+sparse (pastures x stations) matrix, computed once when the assigner is
+created and restricted to the stations some pasture actually uses, at most
+k per pasture. Only those stations' weather is loaded, and each call to
+`assign` applies the weights to all days and weather columns at once as a
+single sparse matrix product over the daily station tensor, instead of
+joining every pasture with every station.
+
+Example usage:
+    assigner = WeatherAssigner(stations, pastures, k=3)
+    station_weather = load_station_weather(assigner.used_station_ids)
+    pasture_weather = assigner.assign(station_weather)
+    pasture_weather["P13"]  # DataFrame with Date and the weather columns
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+from src.config import PASTURE_LOCATIONS_FILE, STATION_WEATHER_DIR, STATIONS_FILE
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def _to_xyz(coords):
+    """
+    Converts (Latitude, Longitude) in degrees to 3D points on the Earth's
+    surface in km, so that KD-tree distances are straight-line distances.
+    """
+    lat = np.radians(coords["Latitude"].to_numpy(dtype=np.float64))
+    lon = np.radians(coords["Longitude"].to_numpy(dtype=np.float64))
+    return EARTH_RADIUS_KM * np.column_stack(
+        [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)]
+    )
+
+
+def read_locations(path):
+    """
+    Reads a CSV of locations with an ID column followed by 'Latitude' and
+    'Longitude', e.g. Pasture,Latitude,Longitude.
+
+    Returns:
+    pandas DataFrame indexed by the ID column.
+    """
+    df = pd.read_csv(path)
+    return df.set_index(df.columns[0])
+
+
+def load_station_weather(station_ids, directory=STATION_WEATHER_DIR):
+    """
+    Reads the daily weather CSV of each station, '<station>.csv' with a
+    'Date' column, from the station weather directory.
+
+    Returns:
+    dict of station ID -> pandas DataFrame
+    """
+    return {
+        station_id: pd.read_csv(directory / f"{station_id}.csv", parse_dates=["Date"])
+        for station_id in station_ids
+    }
+
+
+def has_station_data():
+    """True if the pasture and station location files are available."""
+    return PASTURE_LOCATIONS_FILE.exists() and STATIONS_FILE.exists()
+
+
+class WeatherAssigner:
+    """
+    Nearest-station weather for many pastures.
+
+    The pasture -> station weights are computed once here and reused by
+    every call to `assign`. `weights` only has columns for the stations in
+    `used_station_ids`, the ones with a non-zero weight for some pasture.
+
+    Parameters:
+    stations : pandas DataFrame - Station locations indexed by station ID,
+        with 'Latitude' and 'Longitude' columns.
+    pastures : pandas DataFrame - Pasture locations indexed by pasture ID,
+        with 'Latitude' and 'Longitude' columns.
+    k : int - Number of nearest stations to blend per pasture.
+    power : float - Inverse-distance weighting power; the weight of a
+        station is 1 / distance ** power.
+    max_distance_km : float, optional - Stations further away are ignored.
+    """
+
+    def __init__(self, stations, pastures, k=1, power=2.0, max_distance_km=None):
+        self.station_ids = list(stations.index)
+        self.pasture_ids = list(pastures.index)
+        self.k = min(k, len(self.station_ids))
+        self.power = power
+        self.max_distance_km = max_distance_km
+        self.tree = cKDTree(_to_xyz(stations))
+
+        weights = self._weights(pastures)
+        used = np.unique(weights.indices)
+        self.weights = weights[:, used]
+        self.used_station_ids = [self.station_ids[i] for i in used]
+
+    def _weights(self, pastures):
+        """
+        Returns the sparse (n_pastures x n_stations) matrix of normalized
+        inverse-distance weights.
+        """
+        upper_bound = np.inf if self.max_distance_km is None else self.max_distance_km
+        distances, indices = self.tree.query(
+            _to_xyz(pastures), k=self.k, distance_upper_bound=upper_bound
+        )
+        distances = distances.reshape(len(pastures), self.k)
+        indices = indices.reshape(len(pastures), self.k)
+
+        # Missing neighbours (beyond max_distance_km) come back as inf
+        found = np.isfinite(distances)
+        if not found[:, 0].all():
+            missing = list(pastures.index[~found[:, 0]])
+            raise ValueError(f"No weather station within range of {missing}")
+
+        with np.errstate(divide="ignore"):
+            inverse = np.where(found, 1.0 / distances**self.power, 0.0)
+        # A station on top of the pasture takes all the weight
+        exact = distances == 0
+        inverse = np.where(exact.any(axis=1, keepdims=True), exact * 1.0, inverse)
+        inverse /= inverse.sum(axis=1, keepdims=True)
+
+        rows = np.repeat(np.arange(len(pastures)), self.k)
+        return sparse.csr_matrix(
+            (inverse[found], (rows[found.ravel()], indices[found])),
+            shape=(len(pastures), len(self.station_ids)),
+        )
+
+    def assign(self, station_weather, columns=None):
+        """
+        Blends the daily station weather into daily weather per pasture.
+
+        Missing station values (NaN) are left out of the blend and the
+        remaining weights renormalized, so a gap at one station does not
+        blank out the pasture. Repeated dates of a station are averaged.
+
+        Parameters:
+        station_weather : dict - Station ID -> DataFrame with a 'Date'
+            column and the weather columns. Only the stations in
+            `used_station_ids` are needed; others are ignored.
+        columns : list of str, optional - Weather columns to blend;
+            defaults to the numeric columns of the first used station.
+
+        Returns:
+        dict of pasture ID -> pandas DataFrame with 'Date' and columns.
+        """
+        missing = [s for s in self.used_station_ids if s not in station_weather]
+        if missing:
+            raise KeyError(f"No weather for stations {missing}")
+
+        if columns is None:
+            first = station_weather[self.used_station_ids[0]]
+            columns = [
+                col
+                for col in first.select_dtypes(include="number").columns
+                if col not in ["YEAR", "MONTH", "DAY"]
+            ]
+
+        daily = [
+            station_weather[station_id].groupby("Date")[columns].mean()
+            for station_id in self.used_station_ids
+        ]
+        dates = pd.DatetimeIndex(
+            np.unique(np.concatenate([df.index.to_numpy() for df in daily]))
+        )
+
+        # Daily station tensor, flattened to (n_used_stations, n_days * n_columns)
+        tensor = np.stack(
+            [df.reindex(dates).to_numpy(dtype=np.float64) for df in daily]
+        ).reshape(len(daily), -1)
+
+        # Zero the gaps in place rather than copying the tensor
+        observed = ~np.isnan(tensor)
+        np.nan_to_num(tensor, copy=False, nan=0.0)
+        total = self.weights @ tensor
+        weight_sum = self.weights @ observed.astype(np.float32)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            blended = np.where(weight_sum > 0, total / weight_sum, np.nan)
+        blended = blended.reshape(len(self.pasture_ids), len(dates), len(columns))
+
+        pasture_weather = {}
+        for pasture_id, values in zip(self.pasture_ids, blended):
+            df = pd.DataFrame(values, columns=columns)
+            df.insert(0, "Date", dates)
+            pasture_weather[pasture_id] = df
+        return pasture_weather
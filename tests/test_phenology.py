@@ -0,0 +1,120 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.services.phenology import SeasonTracker
+
+FIELDS = ["c", "c_date", "a", "b", "g1", "g2", "SOS_date", "SOS", "EOS_date", "EOS"]
+
+
+def batch_growth_conditions(pasture_df):
+    """The growth-conditions loop of preprocessing_01, for one pasture."""
+    results = []
+    for year in pasture_df["Date"].dt.year.unique():
+        grp = pasture_df[pasture_df["Date"].dt.year == year]
+        growing_season = grp[(grp["Date"].dt.month >= 3) & (grp["Date"].dt.month <= 10)]
+        c = growing_season["EVI"].max()
+        c_date = growing_season[growing_season["EVI"] == c]["Date"].iloc[0]
+        before_peak = growing_season[growing_season["Date"] < c_date]
+        after_peak = growing_season[growing_season["Date"] > c_date]
+        a = before_peak["EVI"].min() if not before_peak.empty else None
+        b = after_peak["EVI"].min() if not after_peak.empty else None
+        g1 = c - a if a is not None else None
+        g2 = c - b if b is not None else None
+        SOS_date = (
+            before_peak[before_peak["EVI"] >= a + 0.20 * g1]["Date"].min()
+            if a is not None
+            else None
+        )
+        EOS_date = (
+            after_peak[after_peak["EVI"] <= b + 0.20 * g2]["Date"].max()
+            if b is not None
+            else None
+        )
+        SOS = SOS_date.dayofyear if SOS_date is not None else None
+        EOS = EOS_date.dayofyear if EOS_date is not None else None
+        results.append(
+            {
+                "Year": year,
+                "c": c,
+                "c_date": c_date,
+                "a": a,
+                "b": b,
+                "g1": g1,
+                "g2": g2,
+                "SOS_date": SOS_date,
+                "SOS": SOS,
+                "EOS_date": EOS_date,
+                "EOS": EOS,
+            }
+        )
+    return results
+
+
+def synthetic_pasture(seed, start="2000-01-01", end="2003-12-31", freq="16D"):
+    """Gaussian EVI curve per year plus noise, at a MODIS-like cadence."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, end, freq=freq)
+    peak_doy = rng.uniform(150, 230, len(dates))
+    width = rng.uniform(30, 70, len(dates))
+    evi = 0.2 + 0.4 * np.exp(-(((dates.dayofyear - peak_doy) / width) ** 2))
+    evi += rng.normal(0, 0.05, len(dates))
+    return pd.DataFrame({"Date": dates, "EVI": evi, "Pasture": "P13"})
+
+
+def assert_same(online, batch):
+    for name in FIELDS:
+        expected = batch[name]
+        if expected is None or pd.isna(expected):
+            assert online[name] is None or pd.isna(online[name]), name
+        else:
+            assert online[name] == expected, name
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_streamed_season_matches_batch(seed):
+    df = synthetic_pasture(seed)
+    tracker = SeasonTracker()
+
+    for batch in batch_growth_conditions(df):
+        tracker.update_many(df[df["Date"].dt.year == batch["Year"]])
+        online = tracker.status().iloc[0]
+        assert online["Year"] == batch["Year"]
+        assert_same(online, batch)
+
+
+def test_daily_season_matches_batch():
+    df = synthetic_pasture(0, start="2010-01-01", end="2010-12-31", freq="D")
+    tracker = SeasonTracker()
+    tracker.update_many(df)
+
+    assert_same(tracker.status().iloc[0], batch_growth_conditions(df)[0])
+
+
+def test_checkpoint_round_trip(tmp_path):
+    df = synthetic_pasture(1)
+    path = tmp_path / "season_state.json"
+    first_half = df[df["Date"] < "2002-07-01"]
+    second_half = df[df["Date"] >= "2002-07-01"]
+
+    tracker = SeasonTracker()
+    tracker.update_many(first_half)
+    tracker.save(path)
+    restored = SeasonTracker.load(path)
+    pd.testing.assert_frame_equal(restored.status(), tracker.status())
+
+    restored.update_many(second_half)
+    uninterrupted = SeasonTracker()
+    uninterrupted.update_many(df)
+    pd.testing.assert_frame_equal(restored.status(), uninterrupted.status())
+
+
+def test_out_of_order_observation_raises():
+    tracker = SeasonTracker()
+    tracker.update("P13", "2020-05-10", 0.4)
+    with pytest.raises(ValueError):
+        tracker.update("P13", "2020-05-01", 0.3)
@@ -0,0 +1,100 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.modeling.sequences import SequenceDataset
+
+# (start, days) of the two seasons of each pasture; 2001 has a gap mid-season
+SEASONS = [("2000-04-01", 40), ("2001-04-01", 25), ("2001-05-10", 30)]
+
+
+def season_frames():
+    """
+    Two pastures with season-filtered daily rows. ROW numbers the rows of
+    each segment consecutively, and SEGMENT identifies pasture and season.
+    """
+    frames = []
+    for pasture in range(2):
+        parts = []
+        for segment, (start, days) in enumerate(SEASONS):
+            row = np.arange(days, dtype=np.float64)
+            parts.append(
+                pd.DataFrame(
+                    {
+                        "Date": pd.date_range(start, periods=days),
+                        "ROW": row,
+                        "SEGMENT": pasture * 10 + segment,
+                        "EVI": pasture * 10 + segment + row / 100,
+                    }
+                )
+            )
+        frames.append(pd.concat(parts, ignore_index=True))
+    return frames
+
+
+@pytest.mark.parametrize("lookback, horizon", [(1, 1), (7, 1), (10, 5), (20, 6)])
+def test_windows_stay_inside_one_season(lookback, horizon):
+    dataset = SequenceDataset.from_frames(
+        season_frames(),
+        lookback,
+        horizon=horizon,
+        feature_columns=["ROW", "SEGMENT"],
+    )
+
+    span = lookback + horizon - 1
+    assert len(dataset) == 2 * sum(max(days - span, 0) for _, days in SEASONS)
+
+    for i in range(len(dataset)):
+        X, y = dataset[i]
+        segment = X[0, 1]
+        assert X.shape == (lookback, 2)
+        assert np.all(X[:, 1] == segment)
+        assert np.array_equal(X[:, 0], X[0, 0] + np.arange(lookback))
+        # The target is from the same segment, horizon days after the window
+        assert y == pytest.approx(segment + (X[-1, 0] + horizon) / 100)
+
+
+def test_target_index(lookback=10, horizon=3):
+    dataset = SequenceDataset.from_frames(
+        season_frames(), lookback, horizon=horizon, feature_columns=["ROW"]
+    )
+    for i, start in enumerate(dataset.starts):
+        X, y = dataset[i]
+        assert np.shares_memory(X, dataset.features)
+        assert np.array_equal(X, dataset.features[start : start + lookback])
+        assert y == dataset.targets[start + lookback + horizon - 1]
+
+
+def test_batches_match_getitem():
+    dataset = SequenceDataset.from_frames(
+        season_frames(), 5, horizon=2, feature_columns=["ROW", "SEGMENT"]
+    )
+    by_start = {start: dataset[i] for i, start in enumerate(dataset.starts)}
+
+    seen = []
+    for X, y in dataset.batches(batch_size=16, seed=0):
+        assert len(X) == len(y) <= 16
+        for window, target in zip(X, y):
+            # ROW and SEGMENT identify the window's first row uniquely
+            matches = [
+                start
+                for start, (expected, _) in by_start.items()
+                if np.array_equal(window, expected)
+            ]
+            assert len(matches) == 1
+            assert target == by_start[matches[0]][1]
+            seen.append(matches[0])
+
+    assert sorted(seen) == sorted(dataset.starts)
+
+
+def test_target_is_not_a_default_feature():
+    dataset = SequenceDataset.from_frames(season_frames(), 5)
+    assert "EVI" not in dataset.feature_columns
+
+    with pytest.raises(ValueError):
+        SequenceDataset.from_frames(season_frames(), 5, horizon=0)
@@ -0,0 +1,103 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.services.weather import WeatherAssigner
+
+STATIONS = pd.DataFrame(
+    {
+        "Latitude": [35.0, 36.0, 35.5, 40.0],
+        "Longitude": [-97.0, -97.0, -98.0, -90.0],
+    },
+    index=["A", "B", "C", "FAR"],
+)
+PASTURES = pd.DataFrame(
+    {"Latitude": [35.0, 35.9, 35.4], "Longitude": [-97.0, -97.1, -97.6]},
+    index=["P13", "P14", "P15"],
+)
+DATES = pd.date_range("2000-01-01", periods=4)
+
+
+def station_weather(values):
+    """Station ID -> frame with one TAVG value per day."""
+    return {
+        station_id: pd.DataFrame({"Date": DATES, "TAVG": tavg})
+        for station_id, tavg in values.items()
+    }
+
+
+@pytest.mark.parametrize("k", [1, 2, 3])
+def test_weight_rows_sum_to_one(k):
+    assigner = WeatherAssigner(STATIONS, PASTURES, k=k)
+    weights = assigner.weights.toarray()
+
+    assert weights.shape == (len(PASTURES), len(assigner.used_station_ids))
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+    assert np.all((weights > 0).sum(axis=1) <= k)
+    # Stations nobody uses are left out of the matrix
+    assert "FAR" not in assigner.used_station_ids
+
+
+def test_station_at_pasture_takes_all_weight():
+    assigner = WeatherAssigner(STATIONS, PASTURES, k=3)
+    weights = pd.DataFrame(
+        assigner.weights.toarray(),
+        index=assigner.pasture_ids,
+        columns=assigner.used_station_ids,
+    )
+
+    # P13 is exactly at station A
+    assert weights.loc["P13", "A"] == 1.0
+    assert weights.loc["P13"].drop("A").eq(0).all()
+    # The other pastures blend several stations, nearest weighted most
+    assert weights.loc["P14"].idxmax() == "B"
+    assert (weights.loc["P15"] > 0).sum() == 3
+
+
+def test_no_station_in_range_raises():
+    remote = pd.DataFrame({"Latitude": [45.0], "Longitude": [-110.0]}, index=["P99"])
+    with pytest.raises(ValueError, match="P99"):
+        WeatherAssigner(STATIONS, remote, k=2, max_distance_km=50)
+
+
+def test_max_distance_drops_far_stations():
+    assigner = WeatherAssigner(STATIONS, PASTURES.loc[["P14"]], k=3, max_distance_km=50)
+    assert assigner.used_station_ids == ["B"]
+    np.testing.assert_allclose(assigner.weights.toarray(), [[1.0]])
+
+
+def test_nan_station_values_are_renormalized():
+    assigner = WeatherAssigner(STATIONS, PASTURES.loc[["P15"]], k=3)
+    weights = dict(zip(assigner.used_station_ids, assigner.weights.toarray()[0]))
+    values = {
+        "A": [10.0, 10.0, np.nan, np.nan],
+        "B": [20.0, np.nan, 20.0, np.nan],
+        "C": [30.0, 30.0, 30.0, np.nan],
+    }
+
+    tavg = assigner.assign(station_weather(values))["P15"]["TAVG"].to_numpy()
+
+    def blend(stations):
+        total = sum(weights[s] for s in stations)
+        return sum(weights[s] * values[s][0] for s in stations) / total
+
+    np.testing.assert_allclose(tavg[:3], [blend("ABC"), blend("AC"), blend("BC")])
+    assert np.isnan(tavg[3])
+
+
+def test_assign_uses_only_used_stations_and_averages_repeated_dates():
+    assigner = WeatherAssigner(STATIONS, PASTURES.loc[["P13"]], k=1)
+    weather = station_weather({"A": [1.0, 2.0, 3.0, 4.0]})
+    # A repeated date is averaged rather than failing the reindex
+    weather["A"] = pd.concat(
+        [weather["A"], pd.DataFrame({"Date": [DATES[0]], "TAVG": [3.0]})]
+    )
+
+    result = assigner.assign(weather)["P13"]
+
+    assert list(result["Date"]) == list(DATES)
+    np.testing.assert_allclose(result["TAVG"], [2.0, 2.0, 3.0, 4.0])